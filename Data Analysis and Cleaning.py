@@ -1,36 +1,91 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, simpledialog
 import pandas as pd
+import matplotlib
+# Plots are only ever written to files, so never initialise a GUI canvas for them
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import logging
+import warnings
 import time
 import pdfkit
 import os
-from scipy import stats
 import numpy as np
+from scipy.stats import gaussian_kde
 import shutil
+import queue
+from sqlalchemy import create_engine
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from histogram_worker import plot_hist_batch
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Characters stripped from values before attempting numeric conversion
+CURRENCY_TABLE = str.maketrans('', '', '$,')
+
+# Files at least this large are read in chunks instead of all at once
+CHUNKED_READ_MIN_BYTES = 256 * 1024 * 1024
+
+# Read buffer used when streaming large files in chunks
+READ_BUFFER_BYTES = 1 << 20
+
+# Frames with at least this many rows are deduplicated via per-row hashes
+HASH_DEDUP_MIN_ROWS = 100_000
+
+# Export tuning: file write buffer, rows formatted per CSV chunk and rows per SQL batch
+EXPORT_BUFFER_BYTES = 1 << 20
+EXPORT_CHUNK_ROWS = 100_000
+SQL_CHUNK_ROWS = 10_000
+
+# Oldest SQLite builds cap the number of bound parameters per statement at 999
+SQLITE_MAX_VARIABLES = 999
+
+# Number of bins in every histogram
+HIST_BINS = 50
+
+# Histograms are drawn in worker processes only for frames with at least this many numeric columns
+PARALLEL_HIST_MIN_COLUMNS = 32
+
+# Histogram KDE overlays are fitted on at most this many sampled values
+KDE_MAX_SAMPLES = 10_000
+
+# Pair plots are drawn from at most this many sampled rows and highest-variance columns
+PAIR_PLOT_MAX_ROWS = 5000
+PAIR_PLOT_MAX_COLUMNS = 12
+
 # Define functions for data loading, cleaning, analysis, exporting, and reporting
-def load_data(file_path):
+def load_data(file_path, chunksize=1_000_000):
     try:
-        # Check if the file is empty
-        if os.stat(file_path).st_size == 0:
+        # A single stat both rejects empty files and picks the read strategy
+        file_size = os.stat(file_path).st_size
+        if file_size == 0:
             logging.error(f"The file {file_path} is empty.")
             return None
 
-        data = pd.read_csv(file_path)
-
-        # Check for a completely empty DataFrame
-        if data.empty:
-            logging.error(f"No data found in {file_path}.")
-            return None
+        # Small files are parsed in one go with the multithreaded PyArrow engine,
+        # which does not support chunked reads
+        if chunksize is None or file_size < CHUNKED_READ_MIN_BYTES:
+            logging.info(f"Reading data from {file_path}")
+            return [read_csv_fast(file_path)]
 
-        logging.info(f"Data successfully loaded from {file_path}")
-        return data
+        logging.info(f"Reading data from {file_path} in chunks of {chunksize} rows")
+        return read_csv_chunks(file_path, chunksize)
     except FileNotFoundError:
         logging.error(f"File not found: {file_path}")
         return None
@@ -44,26 +99,163 @@ def load_data(file_path):
         logging.error(f"Error loading data from {file_path}: {e}")
         return None
 
-def clean_data(data):
+def read_csv_fast(file_path):
+    # Parse errors propagate to the caller; only a missing PyArrow selects the C engine
+    if not PYARROW_AVAILABLE:
+        return pd.read_csv(file_path)
+
+    # PyArrow turns a whitespace-only file into a frame with a blank column name, or fails to
+    # parse a file of blank lines, where the C engine raises EmptyDataError; report all alike
     try:
-        initial_row_count = data.shape[0]
+        data = pd.read_csv(file_path, engine='pyarrow')
+    except pd.errors.ParserError:
+        if is_blank_file(file_path):
+            raise pd.errors.EmptyDataError("No columns to parse from file")
+        raise
+    if data.shape[1] == 0 or all(not str(col).strip() for col in data.columns):
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+    return data
+
+def is_blank_file(file_path):
+    # Stops at the first block holding anything but whitespace
+    with open(file_path, 'rb', buffering=0) as file:
+        for block in iter(lambda: file.read(READ_BUFFER_BYTES), b''):
+            if block.strip():
+                return False
+    return True
+
+def read_csv_chunks(file_path, chunksize):
+    # Read the file lazily so peak memory is bounded by the chunk size, not the file size,
+    # through a read buffer much larger than Python's 8 KiB default
+    with open(file_path, 'rb', buffering=READ_BUFFER_BYTES) as file:
+        yield from pd.read_csv(file, chunksize=chunksize)
+
+def load_and_clean_data(file_path, chunksize=1_000_000, progress=None):
+    reader = load_data(file_path, chunksize)
+    if reader is None:
+        return None
+
+    try:
+        parts = []
+        rows_read = 0
+        for chunk in reader:
+            rows_read += len(chunk)
+            # With more than one chunk, shrink each finished part early to bound memory;
+            # a single-part read is only deduplicated once, after conversion below
+            if parts:
+                parts[-1] = drop_duplicate_rows(parts[-1])
+            parts.append(strip_text_and_drop_totals(chunk))
+            if progress is not None:
+                progress(f"Loaded and cleaned {rows_read} rows...")
+    except pd.errors.EmptyDataError:
+        logging.error(f"No data in file: {file_path}")
+        return None
+    except pd.errors.ParserError:
+        logging.error(f"Error parsing the file: {file_path}")
+        return None
+    except Exception as e:
+        logging.error(f"Error loading data from {file_path}: {e}")
+        return None
+
+    # Check for a completely empty DataFrame
+    if not parts or all(part.empty for part in parts):
+        logging.error(f"No data found in {file_path}.")
+        return None
 
-        # Filter out rows that contain the word 'Total' in any column (case-insensitive)
-        data = data[~data.apply(lambda row: row.astype(str).str.contains('Total', case=False).any(), axis=1)]
+    # Each column is converted the same way in every chunk, so the chunks agree on types
+    parts = convert_numeric_columns(parts)
+    data = pd.concat(parts)
 
-        # Remove leading and trailing spaces from string columns
-        for col in data.select_dtypes(include=['object']):
-            data.loc[:, col] = data[col].str.strip()
+    # Duplicates may span chunk boundaries, and values like '$1' and '1' only match after conversion
+    data = drop_duplicate_rows(data)
 
-        # Remove currency symbols and other non-numeric characters from numeric columns
-        for col in data.columns:
-            if data[col].dtype == 'object':
-                # Using .loc to ensure we're modifying the DataFrame in place
-                data.loc[:, col] = data[col].replace('[\$,]', '', regex=True).str.strip()
-                data.loc[:, col] = pd.to_numeric(data[col], errors='coerce')
+    logging.info(f"Cleaned data. Rows before: {rows_read}, Rows after: {len(data)}")
+    logging.info(f"Data successfully loaded from {file_path}")
+    return data
+
+def drop_duplicate_rows(data):
+    # Row hashing only beats drop_duplicates on numeric data; hashing object or string
+    # columns costs more than the comparison it replaces
+    all_numeric = all(pd.api.types.is_numeric_dtype(dtype) for dtype in data.dtypes)
+    if len(data) < HASH_DEDUP_MIN_ROWS or not all_numeric:
+        return data.drop_duplicates()
+
+    # Compare one 64-bit hash per row instead of every cell of every column
+    row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    codes, uniques = pd.factorize(row_hashes)
+    rows = np.arange(len(data))
+    first_rows = np.empty(len(uniques), dtype=np.intp)
+    first_rows[codes[::-1]] = rows[::-1]
+    first_of_row = first_rows[codes]
+    candidates = np.flatnonzero(first_of_row != rows)
+
+    # Confirm every hash match is a real match (NaN equal to NaN, as in drop_duplicates)
+    # and fall back to the exact comparison on a collision
+    is_duplicate = np.ones(len(candidates), dtype=bool)
+    for position in range(data.shape[1]):
+        values = data.iloc[:, position].to_numpy()
+        left, right = values[candidates], values[first_of_row[candidates]]
+        is_duplicate &= (left == right) | (pd.isna(left) & pd.isna(right))
+
+    if not is_duplicate.all():
+        return data.drop_duplicates()
+
+    keep = np.ones(len(data), dtype=bool)
+    keep[candidates] = False
+    return data.iloc[np.flatnonzero(keep)]
+
+def text_columns(data):
+    # Text is read as object columns, or as the dedicated string dtype on newer pandas
+    return [col for col, dtype in data.dtypes.items() if pd.api.types.is_string_dtype(dtype)]
+
+def strip_text_and_drop_totals(data):
+    # Filter out rows that contain the word 'Total' in any string column (case-insensitive)
+    total_mask = np.zeros(len(data), dtype=bool)
+    for col in text_columns(data):
+        total_mask |= data[col].str.contains('Total', case=False, na=False, regex=False).to_numpy()
+    # Copy once here so the column assignments below modify a frame this function owns
+    data = data.loc[~total_mask].copy()
+
+    # Remove leading and trailing spaces from string columns
+    for col in text_columns(data):
+        data[col] = data[col].str.strip()
+    return data
+
+def convert_numeric_columns(parts):
+    """Convert string columns to numeric across all parts of a frame, deciding once per column."""
+    for col in parts[0].columns:
+        text_parts = [i for i, part in enumerate(parts) if pd.api.types.is_string_dtype(part[col].dtype)]
+        if not text_parts:
+            continue
+
+        # Strip currency symbols and parse; a column becomes numeric unless most of its
+        # values across all parts fail to parse as numbers
+        numeric = {i: pd.to_numeric(parts[i][col].str.translate(CURRENCY_TABLE), errors='coerce') for i in text_parts}
+        parsed = sum(int(values.notna().sum()) for values in numeric.values())
+        parsed += sum(int(part[col].notna().sum()) for i, part in enumerate(parts)
+                      if i not in numeric and pd.api.types.is_numeric_dtype(part[col]))
+        present = sum(int(part[col].notna().sum()) for part in parts)
+
+        if parsed > 0.5 * present:
+            for i, values in numeric.items():
+                parts[i][col] = values
+        else:
+            # Keep the column as text everywhere, including parts the CSV reader had typed
+            text_dtype = parts[text_parts[0]][col].dtype
+            for i, part in enumerate(parts):
+                if i not in numeric:
+                    part[col] = part[col].map(str, na_action='ignore').astype(text_dtype)
+    return parts
+
+def clean_data(data):
+    try:
+        initial_row_count = data.shape[0]
+
+        data = strip_text_and_drop_totals(data)
+        data = convert_numeric_columns([data])[0]
 
         # Remove duplicates
-        data = data.drop_duplicates()
+        data = drop_duplicate_rows(data)
 
         final_row_count = data.shape[0]
         logging.info(f"Cleaned data. Rows before: {initial_row_count}, Rows after: {final_row_count}")
@@ -72,103 +264,191 @@ def clean_data(data):
         logging.error(f"Error cleaning data: {e}")
         return None
 
+# Numeric column kernels, JIT-compiled with Numba when it is installed
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _zscore_mask(values, threshold):
+        total = 0.0
+        count = 0
+        for i in prange(values.size):
+            if not np.isnan(values[i]):
+                total += values[i]
+                count += 1
+        mask = np.zeros(values.size, dtype=np.bool_)
+        if count == 0:
+            return mask
+        mean = total / count
+
+        squares = 0.0
+        for i in prange(values.size):
+            if not np.isnan(values[i]):
+                squares += (values[i] - mean) ** 2
+        limit = threshold * np.sqrt(squares / count)
+        if limit == 0.0:
+            return mask
+
+        for i in prange(values.size):
+            mask[i] = abs(values[i] - mean) >= limit
+        return mask
+
+    @njit(parallel=True, cache=True)
+    def _minmax_inplace(values):
+        low = np.inf
+        high = -np.inf
+        for i in prange(values.size):
+            if not np.isnan(values[i]):
+                low = min(low, values[i])
+                high = max(high, values[i])
+        value_range = high - low
+        if value_range == 0.0 or np.isinf(value_range):
+            value_range = 1.0
+        scale = 1.0 / value_range
+        for i in prange(values.size):
+            values[i] = (values[i] - low) * scale
+        return values
+else:
+    def _zscore_mask(values, threshold):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_scores = (values - np.nanmean(values)) / np.nanstd(values)
+        return np.abs(z_scores) >= threshold
+
+    def _minmax_inplace(values):
+        low, high = np.nanmin(values), np.nanmax(values)
+        value_range = (high - low) or 1.0
+        np.subtract(values, low, out=values)
+        np.multiply(values, 1.0 / value_range, out=values)
+        return values
+
+_kernels_warmed_up = False
+
+def warm_up_kernels():
+    """Compile the numeric kernels on a tiny array so the first real run has no JIT delay."""
+    global _kernels_warmed_up
+    if NUMBA_AVAILABLE and not _kernels_warmed_up:
+        sample = np.arange(8, dtype=np.float64)
+        _zscore_mask(sample, 3.0)
+        _minmax_inplace(sample.copy())
+        _kernels_warmed_up = True
+
 def handle_outliers(data, column):
     """Handle outliers in a specific column using the Z-score method and log details."""
-    original_data = data.copy()
-    z_scores = stats.zscore(data[column])
-    outliers_mask = (abs(z_scores) >= 3)
-    outliers = data.loc[outliers_mask, column]
+    values = data[column].to_numpy(dtype=np.float64)
+    outliers_mask = _zscore_mask(values, 3.0)
 
-    # Log details of outliers
-    for index, value in outliers.iteritems():
-        logging.info(f"Outlier found in {column}: index={index}, value={value}")
+    # Log details of outliers in one batch
+    outlier_count = int(outliers_mask.sum())
+    if outlier_count:
+        outlier_index = data.index[outliers_mask][:20].tolist()
+        more = "..." if outlier_count > 20 else ""
+        logging.info(f"{outlier_count} outliers found in {column}: index={outlier_index}{more}")
 
     filtered_data = data.loc[~outliers_mask]
     logging.info(f"Outliers handled in {column}. Entries before: {len(data)}, Entries after: {len(filtered_data)}")
     return filtered_data
 
 def normalize_data(data, column):
-    data[column] = (data[column] - data[column].min()) / (data[column].max() - data[column].min())
+    # Scale a private float64 copy in place so the source frame is never written through a view
+    values = data[column].to_numpy(dtype=np.float64, copy=True)
+    data[column] = _minmax_inplace(values)
     logging.info(f"Data normalized in column: {column}")
     return data
 
-def impute_missing_values(data, column, method='mean'):
+def impute_missing_values(data, columns, method='mean'):
+    # Accept a single column name or a list of them; all are filled in one fillna call
+    if isinstance(columns, str):
+        columns = [columns]
+    selected = data[list(columns)]
+
     if method == 'mean':
-        data[column].fillna(data[column].mean(), inplace=True)
+        fill_values = selected.mean()
     elif method == 'median':
-        data[column].fillna(data[column].median(), inplace=True)
+        fill_values = selected.median()
     elif method == 'mode':
-        data[column].fillna(data[column].mode()[0], inplace=True)
-    logging.info(f"Missing values imputed in {column} using {method} method.")
+        fill_values = selected.mode().iloc[0]
+    else:
+        logging.error(f"Unsupported imputation method: {method}")
+        return data
+
+    data = data.fillna(fill_values.to_dict())
+    logging.info(f"Missing values imputed in {', '.join(map(str, columns))} using {method} method.")
     return data
 
 def export_data(data, filename, format='csv'):
     try:
         if format == 'csv':
-            data.to_csv(filename, index=False)
+            # Stream rows through a large write buffer instead of formatting the whole frame at once
+            with open(filename, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_BYTES, newline='') as file:
+                data.to_csv(file, index=False, chunksize=EXPORT_CHUNK_ROWS)
             logging.info(f"Data exported successfully in CSV format to {filename}")
         elif format == 'excel':
             data.to_excel(f"{filename}.xlsx", index=False)
             logging.info(f"Data exported successfully in Excel format to {filename}.xlsx")
         elif format == 'json':
-            data.to_json(f"{filename}.json")
+            # Line-delimited records can be written and read back one row at a time
+            with open(f"{filename}.json", 'w', encoding='utf-8', buffering=EXPORT_BUFFER_BYTES) as file:
+                data.to_json(file, orient='records', lines=True)
             logging.info(f"Data exported successfully in JSON format to {filename}.json")
         elif format == 'sql':
-            from sqlalchemy import create_engine
-            engine = create_engine('sqlite://', echo=False)
-            data.to_sql(filename, con=engine)
-            logging.info(f"Data exported successfully to SQL database {filename}")
+            engine = create_engine(f"sqlite:///{filename}.db", echo=False)
+            try:
+                # Batch rows into multi-row INSERTs, staying under SQLite's bound-variable limit
+                rows_per_insert = max(1, SQLITE_MAX_VARIABLES // max(1, len(data.columns)))
+                data.to_sql('data', con=engine, if_exists='replace', index=False,
+                            chunksize=min(SQL_CHUNK_ROWS, rows_per_insert), method='multi')
+            finally:
+                engine.dispose()
+            logging.info(f"Data exported successfully to SQL database {filename}.db")
         else:
             logging.error("Unsupported export format specified.")
     except Exception as e:
         logging.error(f"Error exporting data: {e}")
 
-def export_all(data):
-    # Ask user for directory to save files and option to create a new folder
-    directory = filedialog.askdirectory()
-    if directory:
-        # Ask for a new folder name
-        new_folder_name = simpledialog.askstring("Folder Name", "Enter a name for the new folder:")
-        if new_folder_name:
-            # Create a new folder within the selected directory
-            new_folder_path = os.path.join(directory, new_folder_name)
-            os.makedirs(new_folder_path, exist_ok=True)
-
-            # Generate and save all files into the new folder
-            create_heatmap(data)
-            shutil.move('heatmap.png', os.path.join(new_folder_path, 'heatmap.png'))
-
-            create_pair_plot(data)
-            shutil.move('pair_plot.png', os.path.join(new_folder_path, 'pair_plot.png'))
-
-            create_histograms(data)
-            for col in data.select_dtypes(include=['float64', 'int64']).columns:
-                shutil.move(f"{col}_histogram.png", os.path.join(new_folder_path, f"{col}_histogram.png"))
-
-            export_data(data, os.path.join(new_folder_path, 'analysis.csv'), 'csv')
-
-            logging.info("All files exported successfully to " + new_folder_path)
-            messagebox.showinfo("Export Successful", "All files have been exported to " + new_folder_path)
-        else:
-            logging.error("Export cancelled - no folder name provided.")
-            messagebox.showwarning("Export Cancelled", "No folder name provided for export.")
-    else:
-        logging.error("Export cancelled.")
-        messagebox.showwarning("Export Cancelled", "Export process was cancelled.")
-
-def save_plots(data):
-    for col in data.select_dtypes(include=['float64', 'int64']).columns:
-        plt.figure()
-        sns.histplot(data[col], kde=True)
-        plt.title(f"Histogram of {col}")
-        plt.savefig(f"{col}_histogram.png")
-        plt.close()
+def numeric_cols(data):
+    return tuple(data.select_dtypes(include='number').columns)
+
+def _column_summary(values):
+    """Compute describe()-style statistics and histogram counts/edges for a NaN-free array."""
+    n = values.size
+    if n == 0:
+        counts, edges = np.histogram(values, bins=HIST_BINS)
+        stats = {'count': 0.0, 'mean': np.nan, 'std': np.nan, 'min': np.nan,
+                 '25%': np.nan, '50%': np.nan, '75%': np.nan, 'max': np.nan}
+        return stats, counts, edges
+
+    # One partition around the order statistics places min, max and the quartile neighbours
+    positions = np.array([0.25, 0.5, 0.75]) * (n - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    ordered = np.partition(values, np.unique(np.concatenate(([0, n - 1], lower, upper))))
+    quartiles = ordered[lower] + (ordered[upper] - ordered[lower]) * (positions - lower)
+    low, high = ordered[0], ordered[n - 1]
+
+    counts, edges = np.histogram(values, bins=HIST_BINS, range=(low, high))
+    stats = {'count': float(n), 'mean': values.mean(), 'std': values.std(ddof=1) if n > 1 else np.nan,
+             'min': low, '25%': quartiles[0], '50%': quartiles[1], '75%': quartiles[2], 'max': high}
+    return stats, counts, edges
+
+def save_plots(data, cols=None, hists=None, kdes=None):
+    create_histograms(data, cols=cols, hists=hists, kdes=kdes)
 
 def generate_report_with_visualizations(data, report_type='pdf'):
-    save_plots(data)
+    cols = numeric_cols(data)
+
+    # Summary statistics, histogram bins and KDE curves come from the same pass over each column
+    summaries = {}
+    hists = []
+    kdes = []
+    for col in cols:
+        values = data[col].dropna().to_numpy(dtype=np.float64)
+        stats, counts, edges = _column_summary(values)
+        summaries[col] = stats
+        hists.append((counts, edges))
+        kdes.append(_kde_curve(values, counts, edges))
+    save_plots(data, cols, hists, kdes)
+
     report_content = '<h1>Data Analysis Report</h1>'
-    report_content += data.describe().to_html()
-    for col in data.select_dtypes(include=['float64', 'int64']).columns:
+    report_content += pd.DataFrame(summaries).to_html()
+    for col in cols:
         report_content += f'<h2>{col} Histogram</h2>'
         report_content += f'<img src="{col}_histogram.png">'
     if report_type == 'pdf':
@@ -189,17 +469,48 @@ def backup_data(file_path):
     except Exception as e:
         logging.error(f"Failed to create backup: {e}")
 
-def upload_action():
-    global data
+def upload_action(window, progress_label):
     file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
-    if file_path:
-        data = load_data(file_path)
-        if data is not None:
-            data = clean_data(data)
+    if not file_path:
+        return
+
+    # Load and clean on a worker thread; only the Tk thread may touch widgets, so the
+    # worker reports back through a queue that is polled from the event loop
+    results = queue.Queue()
+
+    def _work():
+        try:
+            warm_up_kernels()
+            loaded = load_and_clean_data(file_path, progress=lambda msg: results.put(('progress', msg)))
+            results.put(('done', loaded))
+        except Exception as e:
+            logging.error(f"Error loading data from {file_path}: {e}")
+            results.put(('done', None))
+
+    def _poll():
+        global data
+        while True:
+            try:
+                kind, value = results.get_nowait()
+            except queue.Empty:
+                window.after(100, _poll)
+                return
+            if kind == 'progress':
+                progress_label.config(text=value)
+            else:
+                break
+
+        progress_label.config(text="")
+        if value is not None:
+            data = value
             messagebox.showinfo("Info", "Data loaded and cleaned successfully.")
         else:
             messagebox.showerror("Error", "Failed to load data.")
 
+    progress_label.config(text=f"Loading {os.path.basename(file_path)}...")
+    threading.Thread(target=_work, daemon=True).start()
+    window.after(100, _poll)
+
 def export_action(export_type):
     export_path = filedialog.asksaveasfilename(defaultextension=f".{export_type}")
     if export_path and data is not None:
@@ -212,28 +523,97 @@ def export_action(export_type):
     elif not data:
         messagebox.showerror("Error", "No data to export.")
 
-def create_heatmap(data):
+def correlation_matrix(data, cols):
+    values = data[list(cols)].to_numpy(dtype=np.float64)
+
+    # Constant (or all-missing) columns have no defined correlation, so leave them out of either path
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        std = np.nanstd(values, axis=0)
+    keep = std > 0
+    names = [col for col, kept in zip(cols, keep) if kept]
+    values, std = values[:, keep], std[keep]
+
+    if np.isnan(values).any():
+        # Pairwise NaN handling needs pandas' column-by-column path
+        return data[names].corr()
+
+    values = (values - values.mean(axis=0)) / std
+
+    # A single BLAS matrix product gives every pairwise correlation at once
+    corr = (values.T @ values) / values.shape[0]
+    return pd.DataFrame(corr, index=names, columns=names)
+
+def create_heatmap(data, out_path="heatmap.png", cols=None):
+    if cols is None:
+        cols = numeric_cols(data)
     plt.figure()
-    sns.heatmap(data.corr(), annot=True, cmap='coolwarm')
+    sns.heatmap(correlation_matrix(data, cols), annot=True, cmap='coolwarm')
     plt.title("Heatmap of Correlations")
-    plt.savefig("heatmap.png")
+    plt.savefig(out_path)
     plt.close()
     logging.info("Heatmap created and saved.")
 
-def create_pair_plot(data):
-    plt.figure()
-    sns.pairplot(data)
-    plt.savefig("pair_plot.png")
-    plt.close()
+def create_pair_plot(data, out_path="pair_plot.png", cols=None):
+    if cols is None:
+        cols = numeric_cols(data)
+    numeric = data[list(cols)]
+
+    # Subplot count grows with the square of the column count, so keep the most varied columns
+    if numeric.shape[1] > PAIR_PLOT_MAX_COLUMNS:
+        numeric = numeric[numeric.var().nlargest(PAIR_PLOT_MAX_COLUMNS).index]
+
+    # A uniform sample looks the same at screen resolution and draws far fewer points
+    if len(numeric) > PAIR_PLOT_MAX_ROWS:
+        numeric = numeric.sample(PAIR_PLOT_MAX_ROWS, random_state=0)
+
+    grid = sns.pairplot(numeric, diag_kind='hist', plot_kws={'s': 4, 'alpha': 0.3})
+    grid.savefig(out_path)
+    plt.close(grid.fig)
     logging.info("Pair plot created and saved.")
 
-def create_histograms(data):
-    for col in data.select_dtypes(include=['float64', 'int64']).columns:
-        plt.figure()
-        sns.histplot(data[col], kde=True)
-        plt.title(f"Histogram of {col}")
-        plt.savefig(f"{col}_histogram.png")
-        plt.close()
+def _kde_curve(values, counts, edges):
+    if values.size < 2 or np.ptp(values) == 0:
+        return None
+
+    # Fit the KDE on a bounded sample; the curve is indistinguishable but the cost no longer grows with rows
+    if values.size > KDE_MAX_SAMPLES:
+        values = np.random.default_rng(0).choice(values, KDE_MAX_SAMPLES, replace=False)
+    x = np.linspace(edges[0], edges[-1], 200)
+    # Scale the density to the histogram's count axis
+    y = gaussian_kde(values)(x) * counts.sum() * (edges[1] - edges[0])
+    return x, y
+
+def create_histograms(data, out_dir=".", cols=None, hists=None, kdes=None):
+    if cols is None:
+        cols = numeric_cols(data)
+    if not cols:
+        return
+
+    # Bin in this process and hand the workers only counts, edges and KDE curves, which are cheap to pickle
+    # Columns are only read again when the caller has not already binned them and fitted the KDEs
+    if hists is None or kdes is None:
+        arrays = [data[col].dropna().to_numpy(dtype=np.float64) for col in cols]
+        if hists is None:
+            hists = [np.histogram(values, bins=HIST_BINS) for values in arrays]
+        if kdes is None:
+            kdes = [_kde_curve(values, counts, edges) for values, (counts, edges) in zip(arrays, hists)]
+    out_paths = [os.path.join(out_dir, f"{col}_histogram.png") for col in cols]
+    workers = min(len(cols), os.cpu_count() or 1)
+
+    # Starting a worker costs far more than drawing a few plots, so only go parallel for wide frames
+    if workers == 1 or len(cols) < PARALLEL_HIST_MIN_COLUMNS:
+        plot_hist_batch(cols, hists, kdes, out_paths)
+        logging.info("Histograms created and saved.")
+        return
+
+    # Spawn fresh workers: forking a process that already runs Numba, BLAS or Tk threads can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        list(executor.map(plot_hist_batch,
+                          [cols[i::workers] for i in range(workers)],
+                          [hists[i::workers] for i in range(workers)],
+                          [kdes[i::workers] for i in range(workers)],
+                          [out_paths[i::workers] for i in range(workers)]))
     logging.info("Histograms created and saved.")
 
 def export_all(data):
@@ -247,16 +627,12 @@ def export_all(data):
             new_folder_path = os.path.join(directory, new_folder_name)
             os.makedirs(new_folder_path, exist_ok=True)
 
-            # Generate and move all files into the new folder
-            create_heatmap(data)
-            shutil.move('heatmap.png', os.path.join(new_folder_path, 'heatmap.png'))
-
-            create_pair_plot(data)
-            shutil.move('pair_plot.png', os.path.join(new_folder_path, 'pair_plot.png'))
+            cols = numeric_cols(data)
 
-            create_histograms(data)
-            for col in data.select_dtypes(include=['float64', 'int64']).columns:
-                shutil.move(f"{col}_histogram.png", os.path.join(new_folder_path, f"{col}_histogram.png"))
+            # Generate all files directly inside the new folder
+            create_heatmap(data, os.path.join(new_folder_path, 'heatmap.png'), cols)
+            create_pair_plot(data, os.path.join(new_folder_path, 'pair_plot.png'), cols)
+            create_histograms(data, new_folder_path, cols)
 
             export_data(data, os.path.join(new_folder_path, 'analysis.csv'), 'csv')
 
@@ -273,13 +649,24 @@ class TextHandler(logging.Handler):
     def __init__(self, text_widget):
         super().__init__()
         self.text_widget = text_widget
+        # Records may come from worker threads, so they are queued and written by the Tk thread
+        self.records = queue.Queue()
+        self.text_widget.after(100, self.flush_records)
 
     def emit(self, record):
-        msg = self.format(record)
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, msg + '\n')
-        self.text_widget.configure(state='disabled')
-        self.text_widget.yview(tk.END)
+        self.records.put(self.format(record))
+
+    def flush_records(self):
+        while True:
+            try:
+                msg = self.records.get_nowait()
+            except queue.Empty:
+                break
+            self.text_widget.configure(state='normal')
+            self.text_widget.insert(tk.END, msg + '\n')
+            self.text_widget.configure(state='disabled')
+            self.text_widget.yview(tk.END)
+        self.text_widget.after(100, self.flush_records)
 
 def create_ui():
     window = tk.Tk()
@@ -294,7 +681,7 @@ def create_ui():
     button_frame.pack(fill=tk.X)
 
     # Upload CSV Button
-    upload_button = tk.Button(button_frame, text="Upload CSV", command=upload_action)
+    upload_button = tk.Button(button_frame, text="Upload CSV", command=lambda: upload_action(window, progress_label))
     upload_button.pack(side=tk.LEFT, expand=True)
 
     # Export All Button
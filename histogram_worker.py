@@ -0,0 +1,16 @@
+# Histogram drawing for worker processes. Kept apart from the GUI script so that
+# unpickling the worker function only needs NumPy and Matplotlib.
+from matplotlib.figure import Figure
+
+def plot_hist_batch(cols, hists, kdes, out_paths):
+    # Uses a standalone Figure rather than pyplot state, reused for every column in the batch
+    fig = Figure(figsize=(6, 4))
+    ax = fig.add_subplot()
+    for col, (counts, edges), kde, out_path in zip(cols, hists, kdes, out_paths):
+        ax.clear()
+        # Draw the precomputed bins: one weighted sample at the left edge of each bin
+        ax.hist(edges[:-1], bins=edges, weights=counts)
+        if kde is not None:
+            ax.plot(*kde)
+        ax.set_title(f"Histogram of {col}")
+        fig.savefig(out_path, dpi=90)